@@ -1,20 +1,26 @@
 import argparse
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path, PurePath
+from itertools import repeat
+from pathlib import Path
 
 import boto3
 from osgeo import gdal
-from shapely import geometry
 
 import asf_stac_util
 
 
 gdal.SetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN', 'EMPTY_DIR')
+gdal.SetConfigOption('GDAL_HTTP_MAX_RETRY', '5')
+gdal.SetConfigOption('GDAL_HTTP_RETRY_DELAY', '1')
 
 s3 = boto3.client('s3')
 
 COLLECTION_ID = 'glo-30-hand'
+START_DATETIME = datetime(2010, 12, 1, tzinfo=timezone.utc)
+END_DATETIME = datetime(2015, 2, 1, tzinfo=timezone.utc)
+MAX_WORKERS = 32
 
 
 def get_s3_url() -> str:
@@ -24,12 +30,18 @@ def get_s3_url() -> str:
 
 
 def write_stac_items(s3_keys: list[str], s3_url: str, output_file: Path) -> None:
-    with output_file.open('w') as f:
-        for count, s3_key in enumerate(s3_keys, start=1):
-            print(f'Creating STAC items: {count}/{len(s3_keys)}', end='\r')
-            gdal_info_output = gdal_info(s3_key, s3_url)
-            stac_item = create_stac_item(s3_key, s3_url, gdal_info_output)
-            f.write(asf_stac_util.jsonify_stac_item(stac_item) + '\n')
+    # Each gdal_info call is an HTTP round trip, so overlap them across threads. executor.map queues every key up
+    # front, so cancel whatever is still pending if anything fails rather than fetching the rest first.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, output_file.open('w') as f:
+        gdal_info_outputs = executor.map(gdal_info, s3_keys, repeat(s3_url))
+        try:
+            for count, (s3_key, gdal_info_output) in enumerate(zip(s3_keys, gdal_info_outputs), start=1):
+                print(f'Creating STAC items: {count}/{len(s3_keys)}', end='\r')
+                stac_item = create_stac_item(s3_key, s3_url, gdal_info_output)
+                f.write(asf_stac_util.jsonify_stac_item(stac_item) + '\n')
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
 
 
 def get_dem_url(hand_item_id: str) -> str:
@@ -42,8 +54,18 @@ def gdal_info(s3_key: str, s3_url: str) -> dict:
     return gdal.Info(url, format='json')
 
 
+def bounding_box(item_geometry: dict) -> tuple[float, float, float, float]:
+    # GDAL splits extents that cross the antimeridian into a MultiPolygon
+    if item_geometry['type'] == 'MultiPolygon':
+        polygons = item_geometry['coordinates']
+    else:
+        polygons = [item_geometry['coordinates']]
+    xs, ys = zip(*(point for polygon in polygons for ring in polygon for point in ring))
+    return min(xs), min(ys), max(xs), max(ys)
+
+
 def create_stac_item(s3_key: str, s3_url: str, gdal_info_output: dict) -> dict:
-    item_id = PurePath(s3_key).stem
+    item_id = asf_stac_util.item_id_from_s3_key(s3_key)
     item_geometry = gdal_info_output['wgs84Extent']
     return {
         'type': 'Feature',
@@ -51,8 +73,8 @@ def create_stac_item(s3_key: str, s3_url: str, gdal_info_output: dict) -> dict:
         'id': item_id,
         'properties': {
             'datetime': None,
-            'start_datetime': datetime(2010, 12, 1, tzinfo=timezone.utc),
-            'end_datetime': datetime(2015, 2, 1, tzinfo=timezone.utc),
+            'start_datetime': START_DATETIME,
+            'end_datetime': END_DATETIME,
         },
         'geometry': item_geometry,
         'assets': {
@@ -61,7 +83,7 @@ def create_stac_item(s3_key: str, s3_url: str, gdal_info_output: dict) -> dict:
                 'type': 'image/tiff; application=geotiff',
             },
         },
-        'bbox': geometry.shape(item_geometry).bounds,
+        'bbox': bounding_box(item_geometry),
         'stac_extensions': [],
         'collection': COLLECTION_ID,
         'links': [
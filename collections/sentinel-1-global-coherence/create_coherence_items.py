@@ -1,12 +1,13 @@
 import argparse
-import urllib.parse
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path, PurePath
+from functools import cache, partial
+from multiprocessing import Pool
+from pathlib import Path
 from typing import Optional
 
 import boto3
-from shapely import geometry
 
 import asf_stac_util
 
@@ -37,10 +38,15 @@ SEASONS = {
         'datetime': datetime(2020, 10, 16, 0, tzinfo=timezone.utc),
     },
 }
+START_DATETIME = SEASONS['winter']['start_datetime']
+END_DATETIME = SEASONS['fall']['end_datetime']
 
 COLLECTION_ID = 'sentinel-1-global-coherence'
 SAR_INSTRUMENT_MODE = 'IW'
 SAR_FREQUENCY_BAND = 'C'
+HEMISPHERE_SIGNS = {'N': 1, 'S': -1, 'E': 1, 'W': -1}
+CHUNKSIZE = 1024
+PROCESSES = os.cpu_count() or 1
 
 
 @dataclass(frozen=True)
@@ -55,7 +61,7 @@ class ExtraItemMetadata:
 @dataclass(frozen=True)
 class ItemMetadata:
     id: str
-    bbox: geometry.Polygon
+    bbox: tuple[int, int, int, int]
     tile: str
     product: str
     extra: Optional[ExtraItemMetadata] = None
@@ -68,15 +74,26 @@ def get_s3_url() -> str:
 
 
 def write_stac_items(s3_keys: list[str], s3_url: str, output_file: Path) -> None:
-    with output_file.open('w') as f:
-        for count, s3_key in enumerate(s3_keys, start=1):
-            print(f'Creating STAC items: {count}/{len(s3_keys)}', end='\r')
-            stac_item = create_stac_item(s3_key, s3_url)
-            f.write(asf_stac_util.jsonify_stac_item(stac_item) + '\n')
+    # Building the items is CPU-bound, so spread it across processes rather than threads. Pool.imap queues every
+    # task up front and buffers results without backpressure, so feed it one bounded slice of keys at a time to cap
+    # the number of serialized items held in memory.
+    create_item_json = partial(create_stac_item_json, s3_url=s3_url)
+    slice_size = CHUNKSIZE * PROCESSES
+    with Pool(PROCESSES) as pool, output_file.open('w') as f:
+        for start in range(0, len(s3_keys), slice_size):
+            stac_items = pool.imap(create_item_json, s3_keys[start : start + slice_size], chunksize=CHUNKSIZE)
+            for count, stac_item in enumerate(stac_items, start=start + 1):
+                print(f'Creating STAC items: {count}/{len(s3_keys)}', end='\r')
+                f.write(stac_item + '\n')
+
+
+def create_stac_item_json(s3_key: str, s3_url: str) -> str:
+    return asf_stac_util.jsonify_stac_item(create_stac_item(s3_key, s3_url))
 
 
 def create_stac_item(s3_key: str, s3_url: str) -> dict:
     metadata = parse_s3_key(s3_key)
+    min_x, min_y, max_x, max_y = metadata.bbox
     item = {
         'type': 'Feature',
         'stac_version': '1.0.0',
@@ -86,17 +103,20 @@ def create_stac_item(s3_key: str, s3_url: str) -> dict:
             'sar:instrument_mode': SAR_INSTRUMENT_MODE,
             'sar:frequency_band': SAR_FREQUENCY_BAND,
             'sar:product_type': metadata.product,  # TODO this was hard-coded to COH in Forrest's stac ext code?
-            'start_datetime': SEASONS['winter']['start_datetime'],
-            'end_datetime': SEASONS['fall']['end_datetime'],
+            'start_datetime': START_DATETIME,
+            'end_datetime': END_DATETIME,
+        },
+        'geometry': {
+            'type': 'Polygon',
+            'coordinates': (((max_x, min_y), (max_x, max_y), (min_x, max_y), (min_x, min_y), (max_x, min_y)),),
         },
-        'geometry': geometry.mapping(metadata.bbox),
         'assets': {
             'data': {
-                'href': urllib.parse.urljoin(s3_url, s3_key),
+                'href': s3_url + s3_key,
                 'type': 'image/tiff; application=geotiff',
             },
         },
-        'bbox': metadata.bbox.bounds,
+        'bbox': metadata.bbox,
         'stac_extensions': ['https://stac-extensions.github.io/sar/v1.0.0/schema.json'],
         'collection': COLLECTION_ID,
     }
@@ -114,7 +134,7 @@ def create_stac_item(s3_key: str, s3_url: str) -> dict:
 
 
 def parse_s3_key(s3_key: str) -> ItemMetadata:
-    item_id = PurePath(s3_key).stem
+    item_id = asf_stac_util.item_id_from_s3_key(s3_key)
     parts = item_id.split('_')
     if len(parts) == 3:
         tile, _, product = parts
@@ -144,23 +164,18 @@ def parse_s3_key(s3_key: str) -> ItemMetadata:
     return metadata
 
 
-def bounding_box_from_tile(tile: str) -> geometry.Polygon:
+@cache
+def bounding_box_from_tile(tile: str) -> tuple[int, int, int, int]:
     # "Tiles in the data set are labeled by the upper left coordinate of each 1x1 degree tile"
     # http://sentinel-1-global-coherence-earthbigdata.s3-website-us-west-2.amazonaws.com/#organization
 
-    lat = tile[0]
-    latval = int(tile[1:3])
-
-    lon = tile[3]
-    lonval = int(tile[4:7])
-
-    max_y = latval if lat == 'N' else -latval
+    max_y = HEMISPHERE_SIGNS[tile[0]] * int(tile[1:3])
     min_y = max_y - 1
 
-    min_x = lonval if lon == 'E' else -lonval
+    min_x = HEMISPHERE_SIGNS[tile[3]] * int(tile[4:7])
     max_x = min_x + 1
 
-    return geometry.box(min_x, min_y, max_x, max_y)
+    return min_x, min_y, max_x, max_y
 
 
 def parse_args() -> argparse.Namespace:
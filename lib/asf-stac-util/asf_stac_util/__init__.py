@@ -1,12 +1,18 @@
-import json
 from datetime import datetime, timezone
 
+import orjson
+
+
+def _default(obj: object) -> str:
+    if isinstance(obj, datetime) and obj.tzinfo == timezone.utc:
+        return obj.isoformat().removesuffix('+00:00') + 'Z'
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
 
-def jsonify_stac_item(stac_item: dict) -> str:
-    class DateTimeEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, datetime) and obj.tzinfo == timezone.utc:
-                return obj.isoformat().removesuffix('+00:00') + 'Z'
-            return json.JSONEncoder.default(self, obj)
 
-    return json.dumps(stac_item, cls=DateTimeEncoder)
+def item_id_from_s3_key(s3_key: str) -> str:
+    # For keys of the form .../NAME.tif, returns NAME
+    return s3_key.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+
+
+def jsonify_stac_item(stac_item: dict) -> str:
+    return orjson.dumps(stac_item, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()
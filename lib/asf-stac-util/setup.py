@@ -5,7 +5,7 @@ setup(
     name='asf-stac-util',
     license='BSD',
     include_package_data=True,
-    install_requires=[],
+    install_requires=['orjson'],
     python_requires='~=3.9',
     packages=find_packages(),
 )
@@ -23,7 +23,8 @@ def main() -> None:
         time.sleep(5)
 
         response = CLIENT.batch_get_builds(ids=[build_id])
-        assert len(response['builds']) == 1
+        if len(response['builds']) != 1:
+            raise RuntimeError(f'Expected 1 build for ID {build_id} but got {len(response["builds"])}')
 
         build_status = response['builds'][0]['buildStatus']
         print(f'Build status: {build_status}')
@@ -1,8 +1,21 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+import pytest
 
 import asf_stac_util
 
 
+def test_item_id_from_s3_key():
+    assert asf_stac_util.item_id_from_s3_key('data/tiles/N00E005/N00E005_124D_inc.tif') == 'N00E005_124D_inc'
+
+    assert (
+        asf_stac_util.item_id_from_s3_key('v1/2021/Copernicus_DSM_COG_10_N00_00_E006_00_HAND.tif')
+        == 'Copernicus_DSM_COG_10_N00_00_E006_00_HAND'
+    )
+
+    assert asf_stac_util.item_id_from_s3_key('N00E011_winter_vv_COH36.tif') == 'N00E011_winter_vv_COH36'
+
+
 def test_jsonify_stac_item():
     assert asf_stac_util.jsonify_stac_item(
         {
@@ -17,7 +30,17 @@ def test_jsonify_stac_item():
             'datetime_field': datetime(2022, 11, 30, 12, tzinfo=timezone.utc),
         }
     ) == (
-        '{"str_field": "foo", "int_field": 5, "float_field": 3.1, "bool_field": true, "null_field": null, '
-        '"dict_field": {"str_field": "bar"}, "list_field": [[1, 2], [3, 4]], "tuple_field": [[1, 2], [3, 4]], '
-        '"datetime_field": "2022-11-30T12:00:00Z"}'
+        '{"str_field":"foo","int_field":5,"float_field":3.1,"bool_field":true,"null_field":null,'
+        '"dict_field":{"str_field":"bar"},"list_field":[[1,2],[3,4]],"tuple_field":[[1,2],[3,4]],'
+        '"datetime_field":"2022-11-30T12:00:00Z"}'
     )
+
+
+def test_jsonify_stac_item_non_utc_datetime():
+    with pytest.raises(TypeError):
+        asf_stac_util.jsonify_stac_item({'datetime_field': datetime(2022, 11, 30, 12)})
+
+    with pytest.raises(TypeError):
+        asf_stac_util.jsonify_stac_item(
+            {'datetime_field': datetime(2022, 11, 30, 12, tzinfo=timezone(timedelta(hours=1)))}
+        )
@@ -1,8 +1,10 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import create_coherence_items
 from create_coherence_items import SEASONS
-from shapely import geometry
+
+import asf_stac_util
 
 
 def test_season_datetime_averages():
@@ -32,7 +34,8 @@ def test_season_datetime_averages():
 
 
 def test_create_stac_item_N00E005_124D_inc():
-    assert create_coherence_items.create_stac_item('data/tiles/N00E005/N00E005_124D_inc.tif', 'foo.com/') == {
+    item = create_coherence_items.create_stac_item('data/tiles/N00E005/N00E005_124D_inc.tif', 'foo.com/')
+    assert item == {
         'type': 'Feature',
         'stac_version': '1.0.0',
         'id': 'N00E005_124D_inc',
@@ -48,11 +51,11 @@ def test_create_stac_item_N00E005_124D_inc():
             'type': 'Polygon',
             'coordinates': (
                 (
-                    (6.0, -1.0),
-                    (6.0, 0.0),
-                    (5.0, 0.0),
-                    (5.0, -1.0),
-                    (6.0, -1.0),
+                    (6, -1),
+                    (6, 0),
+                    (5, 0),
+                    (5, -1),
+                    (6, -1),
                 ),
             ),
         },
@@ -66,6 +69,9 @@ def test_create_stac_item_N00E005_124D_inc():
         'stac_extensions': ['https://stac-extensions.github.io/sar/v1.0.0/schema.json'],
         'collection': create_coherence_items.COLLECTION_ID,
     }
+    assert asf_stac_util.jsonify_stac_item({'geometry': item['geometry'], 'bbox': item['bbox']}) == (
+        '{"geometry":{"type":"Polygon","coordinates":[[[6,-1],[6,0],[5,0],[5,-1],[6,-1]]]},"bbox":[5,-1,6,0]}'
+    )
 
 
 def test_create_stac_item_S78W078_summer_hh_AMP():
@@ -88,11 +94,11 @@ def test_create_stac_item_S78W078_summer_hh_AMP():
             'type': 'Polygon',
             'coordinates': (
                 (
-                    (-77.0, -79.0),
-                    (-77.0, -78.0),
-                    (-78.0, -78.0),
-                    (-78.0, -79.0),
-                    (-77.0, -79.0),
+                    (-77, -79),
+                    (-77, -78),
+                    (-78, -78),
+                    (-78, -79),
+                    (-77, -79),
                 ),
             ),
         },
@@ -108,12 +114,45 @@ def test_create_stac_item_S78W078_summer_hh_AMP():
     }
 
 
+def test_write_stac_items(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(create_coherence_items, 'CHUNKSIZE', 2)
+    monkeypatch.setattr(create_coherence_items, 'PROCESSES', 2)
+
+    # 11 keys in slices of CHUNKSIZE * PROCESSES = 4 keys
+    s3_keys = [f'data/tiles/N00E{lon:03}/N00E{lon:03}_124D_inc.tif' for lon in range(5, 16)]
+    output_file = tmp_path / 'sentinel-1-global-coherence.ndjson'
+    create_coherence_items.write_stac_items(s3_keys, 'foo.com/', output_file)
+
+    progress = capsys.readouterr().out.split('\r')
+    assert progress[:-1] == [f'Creating STAC items: {count}/11' for count in range(1, 12)]
+
+    lines = output_file.read_text().splitlines()
+    assert len(lines) == 11
+    assert [json.loads(line)['id'] for line in lines] == [f'N00E{lon:03}_124D_inc' for lon in range(5, 16)]
+    assert lines[0] == (
+        '{"type":"Feature","stac_version":"1.0.0","id":"N00E005_124D_inc","properties":{"tile":"N00E005",'
+        '"sar:instrument_mode":"IW","sar:frequency_band":"C","sar:product_type":"inc",'
+        '"start_datetime":"2019-12-01T00:00:00Z","end_datetime":"2020-11-30T00:00:00Z"},'
+        '"geometry":{"type":"Polygon","coordinates":[[[6,-1],[6,0],[5,0],[5,-1],[6,-1]]]},'
+        '"assets":{"data":{"href":"foo.com/data/tiles/N00E005/N00E005_124D_inc.tif",'
+        '"type":"image/tiff; application=geotiff"}},"bbox":[5,-1,6,0],'
+        '"stac_extensions":["https://stac-extensions.github.io/sar/v1.0.0/schema.json"],'
+        '"collection":"sentinel-1-global-coherence"}'
+    )
+
+
+def test_write_stac_items_no_keys(tmp_path):
+    output_file = tmp_path / 'sentinel-1-global-coherence.ndjson'
+    create_coherence_items.write_stac_items([], 'foo.com/', output_file)
+    assert output_file.read_text() == ''
+
+
 def test_parse_s3_key():
     assert create_coherence_items.parse_s3_key(
         'data/tiles/N00E005/N00E005_124D_inc.tif'
     ) == create_coherence_items.ItemMetadata(
         id='N00E005_124D_inc',
-        bbox=geometry.box(5, -1, 6, 0),
+        bbox=(5, -1, 6, 0),
         tile='N00E005',
         product='inc',
     )
@@ -122,7 +161,7 @@ def test_parse_s3_key():
         'data/tiles/N00E005/N00E005_fall_vh_AMP.tif'
     ) == create_coherence_items.ItemMetadata(
         id='N00E005_fall_vh_AMP',
-        bbox=geometry.box(5, -1, 6, 0),
+        bbox=(5, -1, 6, 0),
         tile='N00E005',
         product='AMP',
         extra=create_coherence_items.ExtraItemMetadata(
@@ -138,7 +177,7 @@ def test_parse_s3_key():
         'data/tiles/N00E011/N00E011_winter_vv_COH36.tif'
     ) == create_coherence_items.ItemMetadata(
         id='N00E011_winter_vv_COH36',
-        bbox=geometry.box(11, -1, 12, 0),
+        bbox=(11, -1, 12, 0),
         tile='N00E011',
         product='COH36',
         extra=create_coherence_items.ExtraItemMetadata(
@@ -152,10 +191,10 @@ def test_parse_s3_key():
 
 
 def test_bounding_box_from_tile():
-    assert create_coherence_items.bounding_box_from_tile('N49E009') == geometry.box(9, 48, 10, 49)
+    assert create_coherence_items.bounding_box_from_tile('N49E009') == (9, 48, 10, 49)
 
-    assert create_coherence_items.bounding_box_from_tile('N48W090') == geometry.box(-90, 47, -89, 48)
+    assert create_coherence_items.bounding_box_from_tile('N48W090') == (-90, 47, -89, 48)
 
-    assert create_coherence_items.bounding_box_from_tile('S01E012') == geometry.box(12, -2, 13, -1)
+    assert create_coherence_items.bounding_box_from_tile('S01E012') == (12, -2, 13, -1)
 
-    assert create_coherence_items.bounding_box_from_tile('S78W161') == geometry.box(-161, -79, -160, -78)
+    assert create_coherence_items.bounding_box_from_tile('S78W161') == (-161, -79, -160, -78)
@@ -1,6 +1,9 @@
+import json
+import time
 from datetime import datetime, timezone
 
 import create_hand_items
+import pytest
 
 
 def test_get_dem_url():
@@ -99,3 +102,65 @@ def test_create_stac_item():
         )
         == expected
     )
+
+
+def test_write_stac_items(tmp_path, monkeypatch):
+    s3_keys = [f'v1/2021/Copernicus_DSM_COG_10_N00_00_E{index:03}_00_HAND.tif' for index in range(10)]
+
+    def fake_gdal_info(s3_key, s3_url):
+        index = s3_keys.index(s3_key)
+        # Later keys finish first, so out-of-order completion would show up in the output
+        time.sleep((10 - index) * 0.01)
+        return {
+            'wgs84Extent': {
+                'type': 'Polygon',
+                'coordinates': [[[index, 1.0], [index, 0.0], [index + 1, 0.0], [index + 1, 1.0], [index, 1.0]]],
+            }
+        }
+
+    monkeypatch.setattr(create_hand_items, 'gdal_info', fake_gdal_info)
+    monkeypatch.setattr(create_hand_items, 'MAX_WORKERS', 4)
+
+    output_file = tmp_path / 'glo-30-hand.ndjson'
+    create_hand_items.write_stac_items(s3_keys, 'foo.com/', output_file)
+
+    items = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert [item['id'] for item in items] == [
+        f'Copernicus_DSM_COG_10_N00_00_E{index:03}_00_HAND' for index in range(10)
+    ]
+    assert [item['bbox'] for item in items] == [[index, 0.0, index + 1, 1.0] for index in range(10)]
+
+
+def test_write_stac_items_cancels_pending_work(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_gdal_info(s3_key, s3_url):
+        calls.append(s3_key)
+        time.sleep(0.01)
+        return None
+
+    monkeypatch.setattr(create_hand_items, 'gdal_info', fake_gdal_info)
+    monkeypatch.setattr(create_hand_items, 'MAX_WORKERS', 1)
+
+    s3_keys = [f'v1/2021/Copernicus_DSM_COG_10_N00_00_E{index:03}_00_HAND.tif' for index in range(100)]
+    with pytest.raises(TypeError):
+        create_hand_items.write_stac_items(s3_keys, 'foo.com/', tmp_path / 'glo-30-hand.ndjson')
+
+    assert len(calls) < len(s3_keys)
+
+
+def test_create_stac_item_multipolygon_extent():
+    stac_item = create_hand_items.create_stac_item(
+        'v1/2021/Copernicus_DSM_COG_10_N00_00_E179_00_HAND.tif',
+        'foo.com/',
+        {
+            'wgs84Extent': {
+                'type': 'MultiPolygon',
+                'coordinates': [
+                    [[[179.5, 1.0], [179.5, 0.0], [180.0, 0.0], [180.0, 1.0], [179.5, 1.0]]],
+                    [[[-180.0, 1.0], [-180.0, 0.0], [-179.5, 0.0], [-179.5, 1.0], [-180.0, 1.0]]],
+                ],
+            }
+        },
+    )
+    assert stac_item['bbox'] == (-180.0, 0.0, 180.0, 1.0)